@@ -99,9 +99,10 @@ class StorageServerCharm(ops.CharmBase):
 import logging
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from ipaddress import AddressValueError, IPv6Address
-from typing import List, Optional, TypeVar
-from urllib.parse import parse_qs, quote, unquote, urlencode, urlparse, urlunsplit
+from functools import lru_cache
+from operator import itemgetter
+from typing import ClassVar, List, Optional, TypeVar
+from urllib.parse import quote, unquote
 
 import ops
 from ops.charm import (
@@ -185,7 +186,7 @@ class ParseUriError(FilesystemInfoError):
 # ```
 #
 # Note how in the Lustre URI we needed to escape the `@` symbol on the hosts to conform with the URI syntax.
-@dataclass(init=False, frozen=True)
+@dataclass(init=False, frozen=True, slots=True)
 class _UriData:
     """Raw data from the endpoint URI of a relation."""
 
@@ -195,7 +196,7 @@ class _UriData:
     This will mostly correspond to the option `fstype` for the `mount` command.
     """
 
-    hosts: [str]
+    hosts: list[str]
     """List of hosts where the filesystem is deployed on."""
 
     user: str
@@ -210,16 +211,18 @@ class _UriData:
     def __init__(
         self,
         scheme: str,
-        hosts: [str],
+        hosts: list[str],
         user: str = "",
         path: str = "/",
-        options: dict[str, str] = {},
+        options: Optional[dict[str, str]] = None,
     ) -> None:
         if not scheme:
             raise FilesystemInfoError("scheme cannot be empty")
         if not hosts:
             raise FilesystemInfoError("list of hosts cannot be empty")
         path = path or "/"
+        if options is None:
+            options = {}
 
         object.__setattr__(self, "scheme", scheme)
         object.__setattr__(self, "hosts", hosts)
@@ -230,77 +233,188 @@ class _UriData:
     @classmethod
     def from_uri(cls, uri: str) -> "_UriData":
         """Convert an URI string into a `_UriData`."""
-        _logger.debug(f"_UriData.from_uri: parsing `{uri}`")
+        _logger.debug("_UriData.from_uri: parsing `%s`", uri)
 
-        result = urlparse(uri, allow_fragments=False)
-        scheme = str(result.scheme or "")
-        user = unquote(result.username or "")
-        hostname = unquote(result.hostname or "")
-
-        if not hostname or hostname[0] != "(" or hostname[-1] != ")":
-            raise ParseUriError(f"invalid list of hosts for endpoint `{uri}`")
-
-        hosts = hostname[1:-1].split(",")
-        path = unquote(result.path or "")
+        scheme, user, hosts, path, options = _decode_endpoint_uri(uri)
         try:
-            options = (
-                {
-                    key: ",".join(values)
-                    for key, values in parse_qs(result.query, strict_parsing=True).items()
-                }
-                if result.query
-                else {}
+            return _UriData(
+                scheme=scheme, user=user, hosts=list(hosts), path=path, options=dict(options)
             )
-        except ValueError:
-            raise ParseUriError(f"invalid options for endpoint `{uri}`")
-        try:
-            return _UriData(scheme=scheme, user=user, hosts=hosts, path=path, options=options)
         except FilesystemInfoError as e:
             raise ParseUriError(*e.args)
 
     def __str__(self) -> str:
-        user = quote(self.user)
-        hostname = quote(",".join(self.hosts))
-        path = quote(self.path)
+        user = _quote(self.user)
+        hostname = _quote(",".join(self.hosts))
+        path = _quote(self.path if self.path.startswith("/") else f"/{self.path}")
         netloc = f"{user}@({hostname})" if user else f"({hostname})"
-        query = urlencode(self.options)
-        return urlunsplit((self.scheme, netloc, path, query, None))
+        query = "&".join(
+            f"{_quote(key, safe='')}={_quote(value, safe='')}"
+            for key, value in self.options.items()
+        )
+        uri = f"{self.scheme}://{netloc}{path}"
+        return f"{uri}?{query}" if query else uri
+
+
+def _quote_table(safe: str) -> dict[int, str]:
+    """Build a translation table that escapes the ASCII characters that `quote` would escape."""
+    return {c: quote(chr(c), safe=safe) for c in range(128) if quote(chr(c), safe=safe) != chr(c)}
+
+
+_QUOTE_TABLES = {safe: _quote_table(safe) for safe in ("/", "")}
+
+
+def _quote(string: str, safe: str = "/") -> str:
+    """Quote a component of an URI.
+
+    This returns the same result as `urllib.parse.quote`, but ASCII strings are escaped
+    with a single `str.translate` call instead of going through their encoded bytes.
+
+    Args:
+        string: Component to quote.
+        safe: Characters that should not be quoted. Only `"/"` and `""` are supported.
+    """
+    if string.isascii():
+        return string.translate(_QUOTE_TABLES[safe])
+    return quote(string, safe=safe)
+
+
+def _unquote(string: str, plus: bool = False) -> str:
+    """Unquote a component of an URI, skipping the work if there is nothing to decode.
+
+    Args:
+        string: Component to unquote.
+        plus: Also decode `+` as a space, as `application/x-www-form-urlencoded` does.
+    """
+    if plus and "+" in string:
+        string = string.replace("+", " ")
+    return unquote(string) if "%" in string else string
+
+
+def _parse_endpoint_uri(uri: str) -> tuple[str, str, str, str, str]:
+    """Split an endpoint URI into its raw components.
+
+    This only understands the grammar described in `_UriData`, but in exchange it can
+    find all the components with a handful of `str.find` calls instead of going through the
+    generic RFC 3986 parser of `urllib`.
+
+    Returns:
+        A tuple `(scheme, user, hosts, path, query)` with the still quoted components. `hosts`
+        does not include the surrounding parentheses.
+    """
+    scheme_end = uri.find("://")
+    if scheme_end < 1:
+        raise ParseUriError(f"missing scheme for endpoint `{uri}`")
+    scheme = uri[:scheme_end]
+
+    authority_start = scheme_end + 3
+    hosts_start = uri.find("(", authority_start)
+    hosts_end = uri.find(")", hosts_start + 1)
+    if hosts_start == -1 or hosts_end <= hosts_start + 1:
+        raise ParseUriError(f"invalid list of hosts for endpoint `{uri}`")
+
+    if hosts_start == authority_start:
+        user = ""
+    elif uri[hosts_start - 1] == "@":
+        user = uri[authority_start : hosts_start - 1]
+    else:
+        raise ParseUriError(f"invalid user info for endpoint `{uri}`")
+
+    query_start = uri.find("?", hosts_end + 1)
+    if query_start == -1:
+        path = uri[hosts_end + 1 :]
+        query = ""
+    else:
+        path = uri[hosts_end + 1 : query_start]
+        query = uri[query_start + 1 :]
+
+    if path and path[0] != "/":
+        raise ParseUriError(f"invalid path for endpoint `{uri}`")
+
+    return scheme, user, uri[hosts_start + 1 : hosts_end], path, query
+
+
+@lru_cache(maxsize=256)
+def _decode_endpoint_uri(
+    uri: str,
+) -> tuple[str, str, tuple[str, ...], str, tuple[tuple[str, str], ...]]:
+    """Split and unquote all the components of an endpoint URI.
+
+    Endpoints rarely change between hooks, but they are parsed again every time an event or
+    the requirer reads them, so results are cached. Only immutable values are returned to
+    avoid callers sharing mutable state through the cache.
+
+    Returns:
+        A tuple `(scheme, user, hosts, path, options)`, where `options` is a tuple of
+        `(key, value)` pairs.
+    """
+    scheme, user, hostname, path, query = _parse_endpoint_uri(uri)
+
+    user = _unquote(user)
+    hostname = _unquote(hostname)
+    hosts = tuple(hostname.split(",")) if "," in hostname else (hostname,)
+    path = _unquote(path)
+
+    options = {}
+    for pair in query.split("&") if query else ():
+        key, sep, value = pair.partition("=")
+        if not key or not sep:
+            raise ParseUriError(f"invalid options for endpoint `{uri}`")
+        if not value:
+            continue
+        key = _unquote(key, plus=True)
+        value = _unquote(value, plus=True)
+        options[key] = f"{options[key]},{value}" if key in options else value
+
+    return scheme, user, hosts, path, tuple(options.items())
 
 
 def _hostinfo(host: str) -> tuple[str, Optional[int]]:
     """Parse a host string into the hostname and the port."""
-    _logger.debug(f"_hostinfo: parsing `{host}`")
-    if len(host) == 0:
+    _logger.debug("_hostinfo: parsing `%s`", host)
+    if not host:
         raise ParseUriError("invalid empty host")
 
-    pos = 0
-    if host[pos] == "[":
+    if host[0] == "[":
         # IPv6
-        pos = host.find("]", pos)
-        if pos == -1:
+        end = host.find("]")
+        if end == -1:
             raise ParseUriError("unclosed bracket for host")
-        hostname = host[1:pos]
-        pos = pos + 1
+        hostname = host[1:end]
+        extra, sep, port = host[end + 1 :].partition(":")
+        if extra:
+            raise ParseUriError("expected `:` after IPv6 address")
     else:
         # IPv4 or DN
-        pos = host.find(":", pos)
-        if pos == -1:
-            pos = len(host)
-        hostname = host[:pos]
+        hostname, sep, port = host.partition(":")
 
-    if pos == len(host):
+    if not sep:
         return hostname, None
 
-    # more characters after the hostname <==> port
-
-    if host[pos] != ":":
-        raise ParseUriError("expected `:` after IPv6 address")
     try:
-        port = int(host[pos + 1 :])
+        return hostname, int(port)
     except ValueError:
         raise ParseUriError("expected int after `:` in host")
 
-    return hostname, port
+
+def _format_host(hostname: str) -> str:
+    """Format a hostname so that it can be used as a host of an URI.
+
+    IPv6 addresses are the only ones that need to be enclosed in brackets, and they are
+    easily recognizable by their `:` separators, so other addresses skip the validation.
+    """
+    if ":" not in hostname:
+        return hostname
+
+    # Only imported when it is needed, since most hostnames won't be IPv6 addresses.
+    from ipaddress import AddressValueError, IPv6Address
+
+    try:
+        IPv6Address(hostname)
+    except AddressValueError:
+        return hostname
+
+    return f"[{hostname}]"
 
 
 T = TypeVar("T", bound="FilesystemInfo")
@@ -313,6 +427,8 @@ class FilesystemInfo(ABC):
     can be handled by this library must derive this abstract class.
     """
 
+    __slots__ = ()
+
     @classmethod
     @abstractmethod
     def from_uri(cls: type[T], uri: str, model: Model) -> T:
@@ -329,16 +445,28 @@ class FilesystemInfo(ABC):
         be mounted on the client.
         """
 
+    def _grant_all(self, model: Model, relations: List[Relation]) -> None:
+        """Grant permissions for a list of relations to any secrets that this `FilesystemInfo` has.
+
+        Filesystems with secrets can override this to look up their secrets only once
+        for all the relations.
+        """
+        for relation in relations:
+            self.grant(model, relation)
+
     @classmethod
     @abstractmethod
     def filesystem_type(cls) -> str:
         """Get the string identifier of this filesystem type."""
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NfsInfo(FilesystemInfo):
     """Information required to mount an NFS share."""
 
+    FILESYSTEM_TYPE: ClassVar[str] = "nfs"
+    """String identifier of this filesystem type."""
+
     hostname: str
     """Hostname where the NFS server can be reached."""
 
@@ -351,13 +479,13 @@ class NfsInfo(FilesystemInfo):
     @classmethod
     def from_uri(cls, uri: str, _model: Model) -> "NfsInfo":
         """See :py:meth:`FilesystemInfo.from_uri` for documentation on this method."""
-        _logger.debug(f"NfsInfo.from_uri: parsing `{uri}`")
-
-        info = _UriData.from_uri(uri)
+        _logger.debug("NfsInfo.from_uri: parsing `%s`", uri)
 
-        if info.scheme != cls.filesystem_type():
+        if not uri.startswith(f"{cls.FILESYSTEM_TYPE}://"):
             raise ParseUriError("could not parse uri with incompatible scheme into `NfsInfo`")
 
+        info = _UriData.from_uri(uri)
+
         path = info.path
 
         if info.user:
@@ -374,26 +502,24 @@ class NfsInfo(FilesystemInfo):
 
     def to_uri(self, _model: Model) -> str:
         """See :py:meth:`FilesystemInfo.to_uri` for documentation on this method."""
-        try:
-            IPv6Address(self.hostname)
-            host = f"[{self.hostname}]"
-        except AddressValueError:
-            host = self.hostname
-
+        host = _format_host(self.hostname)
         hosts = [f"{host}:{self.port}" if self.port else host]
 
-        return str(_UriData(scheme=self.filesystem_type(), hosts=hosts, path=self.path))
+        return str(_UriData(scheme=self.FILESYSTEM_TYPE, hosts=hosts, path=self.path))
 
     @classmethod
     def filesystem_type(cls) -> str:
         """See :py:meth:`FilesystemInfo.fs_type` for documentation on this method."""
-        return "nfs"
+        return cls.FILESYSTEM_TYPE
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CephfsInfo(FilesystemInfo):
     """Information required to mount a CephFS share."""
 
+    FILESYSTEM_TYPE: ClassVar[str] = "cephfs"
+    """String identifier of this filesystem type."""
+
     fsid: str
     """Cluster identifier."""
 
@@ -403,7 +529,7 @@ class CephfsInfo(FilesystemInfo):
     path: str
     """Path exported within the filesystem."""
 
-    monitor_hosts: [str]
+    monitor_hosts: list[str]
     """List of reachable monitor hosts."""
 
     user: str
@@ -415,31 +541,28 @@ class CephfsInfo(FilesystemInfo):
     @classmethod
     def from_uri(cls, uri: str, model: Model) -> "CephfsInfo":
         """See :py:meth:`FilesystemInfo.from_uri` for documentation on this method."""
-        _logger.debug(f"CephfsInfo.from_uri: parsing `{uri}`")
-        info = _UriData.from_uri(uri)
+        _logger.debug("CephfsInfo.from_uri: parsing `%s`", uri)
 
-        if info.scheme != cls.filesystem_type():
+        if not uri.startswith(f"{cls.FILESYSTEM_TYPE}://"):
             raise ParseUriError("could not parse uri with incompatible scheme into `CephfsInfo`")
 
+        info = _UriData.from_uri(uri)
+
         path = info.path
 
         if not (user := info.user):
             raise ParseUriError("missing user in uri for `CephfsInfo")
 
-        if not (name := info.options.get("name")):
-            raise ParseUriError("missing name in uri for `CephfsInfo`")
-
-        if not (fsid := info.options.get("fsid")):
-            raise ParseUriError("missing fsid in uri for `CephfsInfo`")
+        # Options with empty values are never parsed, so a missing key covers both cases.
+        try:
+            name, fsid, auth = itemgetter("name", "fsid", "auth")(info.options)
+        except KeyError as e:
+            raise ParseUriError(f"missing {e.args[0]} in uri for `CephfsInfo`")
 
         monitor_hosts = info.hosts
 
-        if not (auth := info.options.get("auth")):
-            raise ParseUriError("missing auth info in uri for `CephsInfo`")
-
-        try:
-            kind, data = auth.split(":", 1)
-        except ValueError:
+        kind, sep, data = auth.partition(":")
+        if not sep:
             raise ParseUriError("could not get the kind of auth info")
 
         if kind == "secret":
@@ -468,7 +591,7 @@ class CephfsInfo(FilesystemInfo):
 
         return str(
             _UriData(
-                scheme=self.filesystem_type(),
+                scheme=self.FILESYSTEM_TYPE,
                 hosts=self.monitor_hosts,
                 path=self.path,
                 user=self.user,
@@ -478,14 +601,19 @@ class CephfsInfo(FilesystemInfo):
 
     def grant(self, model: Model, relation: Relation) -> None:
         """See :py:meth:`FilesystemInfo.grant` for documentation on this method."""
+        self._grant_all(model, [relation])
+
+    def _grant_all(self, model: Model, relations: List[Relation]) -> None:
+        """See :py:meth:`FilesystemInfo._grant_all` for documentation on this method."""
         secret = self._get_or_create_auth_secret(model)
 
-        secret.grant(relation)
+        for relation in relations:
+            secret.grant(relation)
 
     @classmethod
     def filesystem_type(cls) -> str:
         """See :py:meth:`FilesystemInfo.fs_type` for documentation on this method."""
-        return "cephfs"
+        return cls.FILESYSTEM_TYPE
 
     def _get_or_create_auth_secret(self, model: Model) -> ops.Secret:
         try:
@@ -500,7 +628,7 @@ class CephfsInfo(FilesystemInfo):
         return secret
 
 
-@dataclass
+@dataclass(slots=True)
 class Endpoint:
     """Endpoint data exposed by a filesystem server."""
 
@@ -514,14 +642,18 @@ class Endpoint:
     # this exposed just in case we need it in the future.
 
 
+_SCHEME_HANDLERS: dict[str, type[FilesystemInfo]] = {
+    info.FILESYSTEM_TYPE: info for info in (NfsInfo, CephfsInfo)
+}
+
+
 def _uri_to_fs_info(uri: str, model: Model) -> FilesystemInfo:
-    scheme = uri.split("://", maxsplit=1)[0]
-    if scheme == NfsInfo.filesystem_type():
-        return NfsInfo.from_uri(uri, model)
-    elif scheme == CephfsInfo.filesystem_type():
-        return CephfsInfo.from_uri(uri, model)
-    else:
+    scheme, sep, _ = uri.partition("://")
+    if not sep:
+        raise ParseUriError(f"missing scheme for endpoint `{uri}`")
+    if (handler := _SCHEME_HANDLERS.get(scheme)) is None:
         raise FilesystemInfoError(f"unsupported filesystem type `{scheme}`")
+    return handler.from_uri(uri, model)
 
 
 class FilesystemEvent(RelationEvent):
@@ -565,12 +697,16 @@ class _BaseInterface(Object):
         """Get list of active relations associated with the relation name."""
         result = []
         for relation in self.charm.model.relations[self.relation_name]:
+            # Exclude relations that don't have any data yet. Loading the databag of the
+            # remote application is enough to detect them, and avoids fetching the databags
+            # of every unit in the relation.
+            if relation.app is None:
+                continue
             try:
-                # Exclude relations that don't have any data yet
-                _ = repr(relation.data)
-                result.append(relation)
+                _ = len(relation.data[relation.app])
             except RuntimeError:
                 continue
+            result.append(relation)
         return result
 
 
@@ -629,8 +765,9 @@ class FilesystemProvides(_BaseInterface):
 
         self._endpoint = uri
 
-        for relation in self.relations:
-            info.grant(self.model, relation)
+        relations = self.relations
+        info._grant_all(self.model, relations)
+        for relation in relations:
             relation.data[self.app]["endpoint"] = uri
 
     def _update_relation(self, event: RelationJoinedEvent) -> None:
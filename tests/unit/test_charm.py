@@ -37,3 +37,33 @@ def test_config_full():
     state = testing.State(config={"hostname": "127.0.0.1", "path": "/srv", "port": 1234})
     out = context.run(context.on.config_changed(), state)
     assert out.unit_status == testing.ActiveStatus()
+
+
+def test_config_leader_sets_endpoint():
+    """Test that the leader shares the endpoint with integrated filesystem clients."""
+    context = testing.Context(NFSServerProxyCharm)
+    relation = testing.Relation(endpoint="filesystem", interface="filesystem_info")
+    peers = testing.PeerRelation(endpoint="server-peers")
+    state = testing.State(
+        leader=True,
+        config={"hostname": "127.0.0.1", "path": "/srv", "port": 1234},
+        relations={relation, peers},
+    )
+    out = context.run(context.on.config_changed(), state)
+    assert out.unit_status == testing.ActiveStatus()
+    assert (
+        out.get_relation(relation.id).local_app_data["endpoint"] == "nfs://(127.0.0.1%3A1234)/srv"
+    )
+    assert out.get_relation(peers.id).local_app_data["endpoint"] == "nfs://(127.0.0.1%3A1234)/srv"
+
+
+def test_relation_joined_shares_stored_endpoint():
+    """Test that the leader shares the endpoint stored in the peer relation with new clients."""
+    context = testing.Context(NFSServerProxyCharm)
+    relation = testing.Relation(endpoint="filesystem", interface="filesystem_info")
+    peers = testing.PeerRelation(
+        endpoint="server-peers", local_app_data={"endpoint": "nfs://(127.0.0.1)/srv"}
+    )
+    state = testing.State(leader=True, relations={relation, peers})
+    out = context.run(context.on.relation_joined(relation), state)
+    assert out.get_relation(relation.id).local_app_data["endpoint"] == "nfs://(127.0.0.1)/srv"
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+"""Test the endpoint URI handling of the filesystem_info library."""
+
+import dataclasses
+
+import pytest
+from charms.filesystem_client.v0.filesystem_info import (
+    CephfsInfo,
+    NfsInfo,
+    ParseUriError,
+    _UriData,
+)
+from ops import testing
+
+from charm import NFSServerProxyCharm
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        _UriData(scheme="nfs", hosts=["192.168.1.1:65535"], path="/export"),
+        _UriData(scheme="nfs", hosts=["[::1]:2049"], path="/srv"),
+        _UriData(
+            scheme="cephfs",
+            hosts=["192.168.1.1", "192.168.1.2", "192.168.1.3"],
+            user="fs@user",
+            path="/exp ort",
+            options={"fsid": "asdf1234", "auth": "plain:QWE+RTY/1234=", "k y": "a&b=c"},
+        ),
+        _UriData(scheme="lustre", hosts=["192.168.227.11@tcp1", "192.168.227.12@tcp1"]),
+    ],
+)
+def test_uri_round_trip(data):
+    """Test that serializing and parsing an URI gives back the same data."""
+    assert _UriData.from_uri(str(data)) == data
+
+
+@pytest.mark.parametrize(
+    "query,options",
+    [
+        ("a=b+c", {"a": "b c"}),
+        ("a=b%20c", {"a": "b c"}),
+        ("a=b%2Bc", {"a": "b+c"}),
+        ("a%20b=c", {"a b": "c"}),
+        ("a=b&a=c", {"a": "b,c"}),
+        ("a=&b=c", {"b": "c"}),
+    ],
+)
+def test_uri_options(query, options):
+    """Test the decoding of the options of an URI."""
+    assert _UriData.from_uri(f"nfs://(host)/srv?{query}").options == options
+
+
+@pytest.mark.parametrize(
+    "uri,expected",
+    [
+        ("nfs://(A)/srv", _UriData(scheme="nfs", hosts=["A"], path="/srv")),
+        ("nfs://u:pw@(a)/srv", _UriData(scheme="nfs", hosts=["a"], user="u:pw", path="/srv")),
+        ("nfs://(a,b%2Cc)", _UriData(scheme="nfs", hosts=["a", "b", "c"], path="/")),
+        ("nfs://([::1]:2049)/srv", _UriData(scheme="nfs", hosts=["[::1]:2049"], path="/srv")),
+        ("nfs://(a/b)/p", _UriData(scheme="nfs", hosts=["a/b"], path="/p")),
+    ],
+)
+def test_uri_parse(uri, expected):
+    """Test that the components of an URI are taken verbatim from the URI."""
+    assert _UriData.from_uri(uri) == expected
+
+
+@pytest.mark.parametrize(
+    "uri",
+    [
+        "",
+        "nfs",
+        "://(a)/srv",
+        "nfs://a/srv",
+        "nfs://(a/srv",
+        "nfs://u(a)/srv",
+        "nfs://(a))/srv",
+        "nfs://(a)srv",
+        "nfs://()/srv",
+        "nfs://(a)/srv?b",
+        "nfs://(a)/srv?=b",
+        "nfs://(a)/srv?a=b&&c=d",
+    ],
+)
+def test_uri_invalid(uri):
+    """Test that invalid URIs are rejected."""
+    with pytest.raises(ParseUriError):
+        _UriData.from_uri(uri)
+
+
+@pytest.mark.parametrize(
+    "info,uri",
+    [
+        (NfsInfo("192.168.1.1", 2049, "/srv"), "nfs://(192.168.1.1%3A2049)/srv"),
+        (NfsInfo("::1", None, "/srv"), "nfs://(%5B%3A%3A1%5D)/srv"),
+        (NfsInfo("nfs.example.com", None, "/"), "nfs://(nfs.example.com)/"),
+    ],
+)
+def test_nfs_info(info, uri):
+    """Test the conversion between `NfsInfo` and URIs."""
+    assert info.to_uri(None) == uri
+    assert NfsInfo.from_uri(uri, None) == info
+
+
+def test_nfs_info_unescaped_port():
+    """Test that NFS URIs can specify the port of the host without escaping it."""
+    assert NfsInfo.from_uri("nfs://([::1]:2049)/srv", None) == NfsInfo("::1", 2049, "/srv")
+
+
+def test_cephfs_info_plain_auth():
+    """Test parsing a CephFS URI that has the key in plain text."""
+    uri = (
+        "cephfs://fsuser@(192.168.1.1,192.168.1.2)/export?fsid=asdf1234&name=fs&auth=plain:QWERTY"
+    )
+    assert CephfsInfo.from_uri(uri, None) == CephfsInfo(
+        fsid="asdf1234",
+        name="fs",
+        path="/export",
+        monitor_hosts=["192.168.1.1", "192.168.1.2"],
+        user="fsuser",
+        key="QWERTY",
+    )
+
+
+@pytest.mark.parametrize(
+    "uri",
+    [
+        "nfs://fsuser@(a)/export?fsid=asdf1234&name=fs&auth=plain:QWERTY",
+        "cephfs://(a)/export?fsid=asdf1234&name=fs&auth=plain:QWERTY",
+        "cephfs://fsuser@(a)/export?fsid=asdf1234&auth=plain:QWERTY",
+        "cephfs://fsuser@(a)/export?fsid=asdf1234&name=fs&auth=QWERTY",
+        "cephfs://fsuser@(a)/export?fsid=asdf1234&name=fs&auth=other:QWERTY",
+    ],
+)
+def test_cephfs_info_invalid(uri):
+    """Test that invalid CephFS URIs are rejected."""
+    with pytest.raises(ParseUriError):
+        CephfsInfo.from_uri(uri, None)
+
+
+def test_relations_skips_missing_remote_app(monkeypatch):
+    """Test that only relations with a remote application are listed, reading only its databag."""
+    context = testing.Context(NFSServerProxyCharm)
+    first = testing.Relation(endpoint="filesystem", remote_app_name="client-a")
+    second = testing.Relation(endpoint="filesystem", remote_app_name="client-b")
+    state = testing.State(relations={first, second})
+    with context(context.on.update_status(), state) as manager:
+        charm = manager.charm
+        backend = charm.model._backend
+        relation_get = backend.relation_get
+        calls = []
+
+        def spy(relation_id, member_name, is_app):
+            calls.append((relation_id, member_name, is_app))
+            return relation_get(relation_id, member_name, is_app)
+
+        monkeypatch.setattr(backend, "relation_get", spy)
+        charm.model.get_relation("filesystem", second.id).app = None
+
+        assert [relation.id for relation in charm._filesystem.relations] == [first.id]
+        assert calls == [(first.id, "client-a", True)]
+
+
+def test_set_info_cephfs_grants_secret(monkeypatch):
+    """Test that the CephFS auth secret is looked up once to grant it to all the relations."""
+    context = testing.Context(NFSServerProxyCharm)
+    relations = [testing.Relation(endpoint="filesystem") for _ in range(3)]
+    peers = testing.PeerRelation(endpoint="server-peers")
+    secret = testing.Secret(tracked_content={"key": "old"}, label="auth", owner="app")
+    state = testing.State(leader=True, relations={*relations, peers}, secrets={secret})
+    info = CephfsInfo(
+        fsid="asdf1234", name="fs", path="/", monitor_hosts=["a"], user="fsuser", key="new"
+    )
+    with context(context.on.update_status(), state) as manager:
+        model = manager.charm.model
+        get_secret = model.get_secret
+        calls = []
+
+        def spy(**kwargs):
+            calls.append(kwargs)
+            return get_secret(**kwargs)
+
+        monkeypatch.setattr(model, "get_secret", spy)
+        manager.charm._filesystem.set_info(info)
+        out = manager.run()
+
+    # Once to build the URI, and once to grant the secret to all relations.
+    assert calls == [{"label": "auth"}, {"label": "auth"}]
+    out_secret = out.get_secret(label="auth")
+    assert out_secret.latest_content == {"key": "new"}
+    assert set(out_secret.remote_grants) == {relation.id for relation in relations}
+    for relation in relations:
+        assert out.get_relation(relation.id).local_app_data["endpoint"].startswith("cephfs://")
+
+
+@pytest.mark.parametrize(
+    "info",
+    [
+        NfsInfo("h", 1, "/s"),
+        CephfsInfo(fsid="id", name="fs", path="/", monitor_hosts=["a"], user="u", key="k"),
+    ],
+)
+def test_info_slots(info):
+    """Test that the filesystem info dataclasses are slotted and still frozen."""
+    assert not hasattr(info, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        info.path = "/other"